@@ -1,12 +1,39 @@
-import networkx as nx
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from matplotlib.collections import LineCollection
+from collections import Counter, defaultdict
+
+# Признак еще не вычисленного значения в кэше (None - допустимый результат)
+_UNSET = object()
+
+
+def curve_points(p1, p2, rad, n=21):
+    """Точки квадратичной кривой Безье между p1 и p2 (изгиб как у arc3 с rad)"""
+    (x1, y1), (x2, y2) = p1, p2
+    cx = (x1 + x2) / 2 + rad * (y2 - y1)
+    cy = (y1 + y2) / 2 - rad * (x2 - x1)
+    points = []
+    for j in range(n):
+        t = j / (n - 1)
+        a, b, c = (1 - t) ** 2, 2 * t * (1 - t), t ** 2
+        points.append((a * x1 + b * cx + c * x2, a * y1 + b * cy + c * y2))
+    return points
+
 
 class KönigsbergBridgesGame:
     def __init__(self):
-        self.graph = nx.MultiGraph()
         self.fig, self.ax = plt.subplots(figsize=(10, 8))
-        self.pos = None
+        
+        # Блиттинг: неподвижный фон сохраняется после каждой полной
+        # перерисовки, а при ходе поверх него рисуются только изменяемые объекты.
+        # Только для окон GUI: Agg-холсты (Agg, inline, окно графиков PyCharm)
+        # умеют copy_from_bbox, но их blit() не обновляет показанное изображение
+        canvas = self.fig.canvas
+        self._use_blit = (getattr(canvas, 'supports_blit', False) and
+                          getattr(type(canvas), 'required_interactive_framework',
+                                  None) is not None)
+        self._bg = None
+        self._animated = []
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
         
         self.areas = {
             'A': "Северный берег реки Преголя",
@@ -25,100 +52,293 @@ class KönigsbergBridgesGame:
             ('C', 'D', {'name': 'Императорский мост', 'color': 'purple'})
         ]
         
+        # Фиксированная раскладка: берега сверху и снизу, острова между ними
+        self.pos = {'A': (0, 1), 'B': (0, -1), 'C': (-0.5, 0), 'D': (1, 0)}
+        
+        # Таблица мостов в виде параллельных списков; id моста - индекс в них,
+        # edge_key_on_uv - номер моста среди параллельных между теми же районами
+        self.edge_u = []
+        self.edge_v = []
+        self.edge_name = []
+        self.edge_color = []
+        self.edge_key_on_uv = []
+        keys = defaultdict(int)
         for a, b, data in self.bridges:
-            self.graph.add_edge(a, b, **data)
+            self.edge_u.append(a)
+            self.edge_v.append(b)
+            self.edge_name.append(data['name'])
+            self.edge_color.append(data['color'])
+            # Ключ считается по неупорядоченной паре, как в MultiGraph
+            pair = frozenset((a, b))
+            self.edge_key_on_uv.append(keys[pair])
+            keys[pair] += 1
+        
+        # Мосты, выходящие из каждого района: (id моста, название, куда ведет)
+        # и поиск моста по (название без учета регистра, пара районов)
+        # Пройденные мосты хранятся битовой маской: у каждого моста свой бит
+        # Изгиб каждого моста: параллельные мосты расходятся симметрично
+        self._incident = defaultdict(list)
+        self._bridge_by_norm_name = {}
+        self._bit = []
+        self._edge_rad = []
+        self._edge_label_t = []
+        group_size = Counter(frozenset(pair) for pair in zip(self.edge_u, self.edge_v))
+        for i, (a, b, name) in enumerate(zip(self.edge_u, self.edge_v, self.edge_name)):
+            self._bit.append(1 << i)
+            self._incident[a].append((i, name, b))
+            self._incident[b].append((i, name, a))
+            self._bridge_by_norm_name[(name.casefold(), frozenset((a, b)))] = i
+            k, m = self.edge_key_on_uv[i], group_size[frozenset((a, b))]
+            # Направление перпендикуляра зависит от порядка концов
+            sign = 1 if a <= b else -1
+            self._edge_rad.append(sign * (k - (m - 1) / 2) * 0.15)
+            # Подписи параллельных мостов разнесены вдоль линий: у вершины
+            # кривой они разошлись бы всего на половину изгиба и перекрылись
+            self._edge_label_t.append(0.5 + sign * (k - (m - 1) / 2) * 0.4)
+        
+        # Раскладка и изгибы не меняются, поэтому точки линий мостов
+        # считаются один раз, а не при каждой перестройке рисунка
+        self._edge_points = [
+            curve_points(self.pos[a], self.pos[b], rad)
+            for a, b, rad in zip(self.edge_u, self.edge_v, self._edge_rad)
+        ]
+        self._edge_label_points = [
+            points[round(t * (len(points) - 1))]
+            for points, t in zip(self._edge_points, self._edge_label_t)
+        ]
+        
+        self._all_bridges = (1 << len(self.bridges)) - 1
+        
+        # Таблицы для перебора состояний (район, маска мостов): районы по
+        # номерам, _edge_other[район][мост] - другой конец моста или -1
+        self._node_index = {n: i for i, n in enumerate(self.areas)}
+        self._edge_other = [[-1] * len(self.bridges) for _ in self.areas]
+        for i, (a, b) in enumerate(zip(self.edge_u, self.edge_v)):
+            self._edge_other[self._node_index[a]][i] = self._node_index[b]
+            self._edge_other[self._node_index[b]][i] = self._node_index[a]
+        self._max_walk_table = [[-1] * (self._all_bridges + 1) for _ in self.areas]
         
-        self.used_bridges = set()
+        self._build_static_labels()
+        
+        # Граф не меняется, поэтому результаты теории считаются один раз
+        self._has_eulerian_cache = _UNSET
+        self._eulerian_path_cache = _UNSET
+        
+        self.used_bridges = 0
         self.current_position = None
         self.path_history = []
     
-    def initialize_visualization(self):
-        """Инициализирует позиции узлов для стабильной визуализации"""
-        self.pos = nx.spring_layout(self.graph)
-        self.update_visualization()
+    def _build_static_labels(self):
+        """Подписи районов и мостов не меняются, готовим их один раз"""
+        self._node_label_strings = {k: f"{k}\n({v})" for k, v in self.areas.items()}
+        self._edge_label_strings = list(self.edge_name)
+    
+    def initialize_visualization(self, defer=False):
+        """Строит рисунок заново перед началом режима"""
+        self.init_plot()
+        self.update_visualization(defer=defer)
     
-    def update_visualization(self, highlight_edges=None, current_node=None):
-        """Обновляет графическое отображение графа"""
+    def init_plot(self):
+        """Создает постоянные объекты рисунка, которые затем только изменяются"""
         self.ax.clear()
         
-        # Рисуем узлы
-        node_colors = ['red' if n == current_node else 'skyblue' for n in self.graph.nodes()]
-        nx.draw_networkx_nodes(self.graph, self.pos, ax=self.ax, 
-                             node_size=2000, node_color=node_colors)
+        # Узлы
+        self._nodes = list(self.areas)
+        self._node_coll = self.ax.scatter(
+            [self.pos[n][0] for n in self._nodes],
+            [self.pos[n][1] for n in self._nodes],
+            s=2000, c='skyblue', zorder=2
+        )
+        
+        # Все мосты одной коллекцией, под узлами (как zorder=1 у networkx)
+        self._edge_coll = LineCollection(self._edge_points, zorder=1)
+        self.ax.add_collection(self._edge_coll)
+        self.ax.autoscale_view()
         
-        # Рисуем все мосты с разными стилями
-        for u, v, key, data in self.graph.edges(keys=True, data=True):
-            edge = (u, v, key)
-            if edge in self.used_bridges:
+        # Подписи узлов
+        self._node_label_artists = {
+            node: self.ax.text(*self.pos[node], label, fontsize=10,
+                               horizontalalignment='center',
+                               verticalalignment='center')
+            for node, label in self._node_label_strings.items()
+        }
+        
+        # Подписи мостов на их линиях
+        self._edge_label_artists = []
+        for i, label in enumerate(self._edge_label_strings):
+            self._edge_label_artists.append(self.ax.text(
+                *self._edge_label_points[i], label, fontsize=8,
+                horizontalalignment='center',
+                verticalalignment='center',
+                bbox=dict(facecolor='white', edgecolor='none', alpha=0.7)
+            ))
+        
+        # История переходов
+        self._history_text = self.ax.text(
+            1.05, 0.5, "",
+            transform=self.ax.transAxes,
+            verticalalignment='center',
+            bbox=dict(facecolor='white', alpha=0.5)
+        )
+        self._rendered_history_len = -1
+        
+        self.ax.set_title("Мосты Кенигсберга (задача Эйлера)")
+        self.ax.axis('off')
+        
+        # Подписи лежат поверх узлов и мостов, поэтому рисуются вместе с ними
+        self._animated = [self._edge_coll, self._node_coll,
+                          *self._node_label_artists.values(),
+                          *self._edge_label_artists, self._history_text]
+        for artist in self._animated:
+            artist.set_animated(self._use_blit)
+        
+        if self._use_blit:
+            plt.show(block=False)
+            self.fig.canvas.draw()
+    
+    def _on_draw(self, event):
+        """После полной перерисовки (в т.ч. изменения размера окна) запоминает фон"""
+        if not self._use_blit:
+            return
+        self._bg = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        """Рисует изменяемые объекты поверх сохраненного фона"""
+        for artist in self._animated:
+            self.ax.draw_artist(artist)
+    
+    def update_artists(self, highlight_edges=None, current_node=None, dimmed_edges=None):
+        """Обновляет цвета узлов, стили мостов и историю; возвращает измененные объекты"""
+        self._node_coll.set_facecolors(
+            ['red' if n == current_node else 'skyblue' for n in self._nodes]
+        )
+        
+        colors, widths, styles = [], [], []
+        for edge, color in enumerate(self.edge_color):
+            if self.used_bridges & self._bit[edge]:
                 # Пройденные мосты
-                edge_color = 'gray'
-                edge_style = 'dashed'
-                edge_width = 1
+                colors.append('gray')
+                styles.append('dashed')
+                widths.append(1)
+            elif dimmed_edges and edge in dimmed_edges:
+                # Доступные мосты, ведущие в тупик
+                colors.append('silver')
+                styles.append('solid')
+                widths.append(3)
             elif highlight_edges and edge in highlight_edges:
                 # Доступные мосты
-                edge_color = 'lime'
-                edge_style = 'solid' 
-                edge_width = 3
+                colors.append('lime')
+                styles.append('solid')
+                widths.append(3)
             else:
                 # Непройденные мосты
-                edge_color = data['color']
-                edge_style = 'solid'
-                edge_width = 2
-            
-            nx.draw_networkx_edges(
-                self.graph, self.pos, ax=self.ax,
-                edgelist=[(u, v)],
-                width=edge_width,
-                edge_color=edge_color,
-                style=edge_style
-            )
+                colors.append(color)
+                styles.append('solid')
+                widths.append(2)
         
-        # Подписи узлов
-        labels = {k: f"{k}\n({v})" for k, v in self.areas.items()}
-        nx.draw_networkx_labels(self.graph, self.pos, ax=self.ax, 
-                              labels=labels, font_size=10)
-        
-        # Подписи мостов
-        edge_labels = {(u, v, key): data['name'] 
-                      for u, v, key, data in self.graph.edges(keys=True, data=True)}
-        nx.draw_networkx_edge_labels(
-            self.graph, self.pos, ax=self.ax,
-            edge_labels=edge_labels,
-            font_size=8,
-            bbox=dict(facecolor='white', edgecolor='none', alpha=0.7)
-        )
+        self._edge_coll.set_colors(colors)
+        self._edge_coll.set_linewidths(widths)
+        self._edge_coll.set_linestyles(styles)
         
-        # История переходов
-        if self.path_history:
-            history_text = "Ваш путь:\n" + "\n".join(
-                f"{i+1}. {name}: {u} → {v}" 
-                for i, (u, v, name) in enumerate(self.path_history[-5:])
-            )
-            self.ax.text(
-                1.05, 0.5, history_text,
-                transform=self.ax.transAxes,
-                verticalalignment='center',
-                bbox=dict(facecolor='white', alpha=0.5)
-            )
+        # История в пределах режима только растет, поэтому хватает сравнить длину
+        new_len = len(self.path_history)
+        if new_len != self._rendered_history_len:
+            self._rendered_history_len = new_len
+            if self.path_history:
+                self._history_text.set_text("Ваш путь:\n" + "\n".join(
+                    f"{i+1}. {name}: {u} → {v}" 
+                    for i, (u, v, name) in enumerate(self.path_history[-5:])
+                ))
+            else:
+                self._history_text.set_text("")
         
-        self.ax.set_title("Мосты Кенигсберга (задача Эйлера)")
-        self.ax.axis('off')
+        return self._node_coll, self._edge_coll, self._history_text
+    
+    def update_visualization(self, highlight_edges=None, current_node=None, defer=False,
+                             dimmed_edges=None):
+        """Обновляет графическое отображение графа
+
+        С defer=True перерисовка только планируется и выполнится
+        при следующем обновлении без defer.
+        """
+        self.update_artists(highlight_edges, current_node, dimmed_edges)
+        canvas = self.fig.canvas
+        if self._bg is not None:
+            if not defer:
+                # История выходит за рамки осей, поэтому обновляется вся фигура
+                canvas.restore_region(self._bg)
+                self._draw_animated()
+                canvas.blit(self.fig.bbox)
+                canvas.flush_events()
+            return
         
-        plt.draw()
-        plt.pause(0.1)
+        canvas.draw_idle()
+        if not defer:
+            # Один кадр (~60 Гц), чтобы окно успело перерисоваться
+            plt.pause(0.016)
     
     def check_eulerian_path(self):
         """Проверяет существование эйлерова пути"""
-        degrees = dict(self.graph.degree())
-        odd_degree_count = sum(1 for degree in degrees.values() if degree % 2 != 0)
-        return odd_degree_count == 0 or odd_degree_count == 2
+        if self._has_eulerian_cache is _UNSET:
+            degrees = Counter(self.edge_u) + Counter(self.edge_v)
+            odd_degree_count = sum(1 for degree in degrees.values() if degree & 1)
+            self._has_eulerian_cache = odd_degree_count in (0, 2)
+        return self._has_eulerian_cache
     
     def find_eulerian_path(self):
         """Пытается найти эйлеров путь"""
-        try:
-            return list(nx.eulerian_path(self.graph))
-        except nx.NetworkXError:
+        if self._eulerian_path_cache is _UNSET:
+            if self.check_eulerian_path():
+                self._eulerian_path_cache = self._hierholzer()
+            else:
+                self._eulerian_path_cache = None
+        return self._eulerian_path_cache
+    
+    def _hierholzer(self):
+        """Алгоритм Хирхольцера за O(N+M): список переходов (u, v, id моста) или None"""
+        adj = defaultdict(list)
+        for i, (u, v) in enumerate(zip(self.edge_u, self.edge_v)):
+            adj[u].append((v, i))
+            adj[v].append((u, i))
+        
+        # Путь начинается в одной из двух нечетных вершин, если они есть
+        odd = [n for n in adj if len(adj[n]) % 2]
+        start = odd[0] if odd else self.edge_u[0]
+        used = [False] * len(self.edge_u)
+        ptr = dict.fromkeys(adj, 0)
+        stack = [(start, None)]
+        path = []
+        while stack:
+            node, via = stack[-1]
+            edges = adj[node]
+            while ptr[node] < len(edges) and used[edges[ptr[node]][1]]:
+                ptr[node] += 1
+            if ptr[node] < len(edges):
+                nxt, i = edges[ptr[node]]
+                used[i] = True
+                stack.append((nxt, i))
+            else:
+                stack.pop()
+                if via is not None:
+                    path.append((stack[-1][0], node, via))
+        
+        # Не все мосты пройдены - граф несвязен
+        if len(path) != len(self.edge_u):
             return None
+        path.reverse()
+        return path
+    
+    def _max_walk(self, node, mask):
+        """Сколько мостов еще можно пройти из района node, если пройдены мосты mask"""
+        table = self._max_walk_table
+        if table[node][mask] < 0:
+            best = 0
+            for edge, other in enumerate(self._edge_other[node]):
+                if other >= 0 and not (mask & self._bit[edge]):
+                    best = max(best, 1 + self._max_walk(other, mask | self._bit[edge]))
+            table[node][mask] = best
+        return table[node][mask]
     
     def interactive_walk(self):
         """Интерактивный режим прохождения"""
@@ -126,21 +346,40 @@ class KönigsbergBridgesGame:
         print("Попробуйте пройти по всем мостам без повторений!")
         print("Введите номер моста или 'Q' для выхода\n")
         
-        self.used_bridges = set()
+        self.used_bridges = 0
         self.current_position = 'A'
         self.path_history = []
-        self.initialize_visualization()
+        self.initialize_visualization(defer=True)
         
         while True:
-            print(f"\nВы находитесь в: {self.areas[self.current_position]} ({self.current_position})")
+            available_bridges = [t for t in self._incident[self.current_position]
+                                 if not (self.used_bridges & self._bit[t[0]])]
             
-            available_bridges = []
-            for u, v, key in self.graph.edges(self.current_position, keys=True):
-                bridge_id = (u, v, key)
-                if bridge_id not in self.used_bridges:
-                    data = self.graph.get_edge_data(u, v, key)
-                    direction = v if u == self.current_position else u
-                    available_bridges.append((bridge_id, data['name'], direction))
+            # Подсказка: сколько всего мостов удастся пройти после каждого хода;
+            # ходы хуже лучшего ведут в тупик
+            done = bin(self.used_bridges).count('1')
+            reachable = {
+                bridge_id: done + 1 + self._max_walk(
+                    self._node_index[direction],
+                    self.used_bridges | self._bit[bridge_id]
+                )
+                for bridge_id, _, direction in available_bridges
+            }
+            best = max(reachable.values(), default=done)
+            dead_ends = [b for b, total in reachable.items() if total < best]
+            
+            # Одно обновление визуализации за ход: новое положение и подсветка
+            self.update_visualization(
+                highlight_edges=[bridge_id for bridge_id, _, _ in available_bridges],
+                current_node=self.current_position,
+                dimmed_edges=dead_ends
+            )
+            
+            if self.used_bridges == self._all_bridges:
+                print("\nПОЗДРАВЛЯЕМ! Вы прошли все мосты!")
+                return
+            
+            print(f"\nВы находитесь в: {self.areas[self.current_position]} ({self.current_position})")
             
             if not available_bridges:
                 print("Нет доступных мостов отсюда!")
@@ -148,13 +387,9 @@ class KönigsbergBridgesGame:
             
             print("Доступные мосты:")
             for i, (bridge_id, name, direction) in enumerate(available_bridges, 1):
-                print(f"{i}. {name} -> {self.areas[direction]} ({direction})")
-            
-            # Обновляем визуализацию с подсветкой
-            self.update_visualization(
-                highlight_edges=[bridge_id for bridge_id, _, _ in available_bridges],
-                current_node=self.current_position
-            )
+                hint = " - тупик" if bridge_id in dead_ends else ""
+                print(f"{i}. {name} -> {self.areas[direction]} ({direction})"
+                      f" [максимум {reachable[bridge_id]}/{len(self.bridges)} мостов{hint}]")
             
             choice = input("Ваш выбор: ").strip().upper()
             
@@ -170,48 +405,56 @@ class KönigsbergBridgesGame:
                     print("Неверный номер!")
                     continue
                 
-                self.used_bridges.add(bridge_id)
+                self.used_bridges |= self._bit[bridge_id]
                 self.path_history.append((self.current_position, next_area, bridge_name))
                 self.current_position = next_area
                 
                 print(f"Переход по {bridge_name} в {self.areas[next_area]}")
-                self.update_visualization(current_node=self.current_position)
-                
-                if len(self.used_bridges) == len(self.bridges):
-                    print("\nПОЗДРАВЛЯЕМ! Вы прошли все мосты!")
-                    return
                 
             except ValueError:
                 print("Введите номер или Q!")
     
-    def validate_user_path(self, path):
-        """Проверяет корректность введенного пути"""
-        used_bridges = set()
-        current_position = path[0][0] if path else None
+    def _validate_step(self, state, u, v, name):
+        """Проверяет один переход из состояния (позиция, пройденные мосты)
+
+        Возвращает (ok, сообщение, новое состояние, id найденного моста или None).
+        """
+        current_position, used_bridges = state
+        if current_position is not None and u != current_position:
+            return False, f"нельзя перейти из {current_position} в {u}", state, None
         
-        for i, (u, v, name) in enumerate(path):
-            if u != current_position:
-                return False, f"Ошибка шага {i+1}: нельзя перейти из {current_position} в {u}"
-            
-            bridge_found = False
-            for edge in self.graph.edges(data=True, keys=True):
-                if edge[3]['name'] == name and ((edge[0] == u and edge[1] == v) or (edge[0] == v and edge[1] == u)):
-                    bridge_id = (edge[0], edge[1], edge[2])
-                    if bridge_id in used_bridges:
-                        return False, f"Мост {name} уже использован (шаг {i+1})"
-                    used_bridges.add(bridge_id)
-                    bridge_found = True
-                    break
-            
-            if not bridge_found:
-                return False, f"Моста {name} между {u} и {v} не существует"
-            
-            current_position = v
+        name_norm = name.strip().casefold()
+        bridge_id = self._bridge_by_norm_name.get((name_norm, frozenset((u, v))))
+        if bridge_id is None:
+            return False, f"моста {name} между {u} и {v} не существует", state, None
+        if used_bridges & self._bit[bridge_id]:
+            return False, f"мост {name} уже использован", state, None
         
-        if len(used_bridges) == len(self.bridges):
+        return True, "", (v, used_bridges | self._bit[bridge_id]), bridge_id
+    
+    def _coverage_result(self, used_bridges):
+        """Итог проверки по числу пройденных мостов"""
+        if used_bridges == self._all_bridges:
             return True, "Великолепно! Все мосты пройдены!"
         else:
-            return False, f"Пройдено {len(used_bridges)}/{len(self.bridges)} мостов"
+            count = bin(used_bridges).count('1')
+            return False, f"Пройдено {count}/{len(self.bridges)} мостов"
+    
+    def validate_user_path(self, path):
+        """Проверяет корректность введенного пути целиком
+
+        Публичная проверка готового списка шагов (u, v, название).
+        manual_path_input ее не вызывает: там каждый шаг проверяется
+        сразу через _validate_step.
+        """
+        state = (path[0][0] if path else None, 0)
+        
+        for i, (u, v, name) in enumerate(path):
+            ok, msg, state, _ = self._validate_step(state, u, v, name)
+            if not ok:
+                return False, f"Ошибка шага {i+1}: {msg}"
+        
+        return self._coverage_result(state[1])
     
     def manual_path_input(self):
         """Режим ручного ввода маршрута"""
@@ -220,11 +463,14 @@ class KönigsbergBridgesGame:
         print("Пример: A, C, Зеленый мост")
         print("Введите 'Готово' для завершения\n")
         
-        path = []
-        self.initialize_visualization()
+        self._path_state = (None, 0)
+        self.used_bridges = 0
+        self.current_position = None
+        self.path_history = []
+        self.initialize_visualization(defer=True)
         
         while True:
-            self.update_visualization()
+            self.update_visualization(current_node=self.current_position)
             user_input = input("Введите переход: ").strip()
             
             if user_input.lower() == 'готово':
@@ -237,32 +483,26 @@ class KönigsbergBridgesGame:
                     continue
                 
                 u, v, name = parts
+                u, v = u.upper(), v.upper()
                 if u not in self.areas or v not in self.areas:
                     print("Ошибка в обозначениях областей!")
                     continue
                 
-                path.append((u.upper(), v.upper(), name))
-                
-                # Валидация и визуализация
-                is_valid, msg = self.validate_user_path(path)
-                if not is_valid and "уже использован" not in msg and "не существует" not in msg:
+                # Проверяем только новый шаг
+                ok, msg, state, bridge_id = self._validate_step(self._path_state, u, v, name)
+                if not ok:
                     print(f"Ошибка: {msg}")
-                    path.pop()
-                else:
-                    self.path_history = path.copy()
-                    self.used_bridges = set()
-                    for step in path:
-                        for edge in self.graph.edges(data=True, keys=True):
-                            if edge[3]['name'] == step[2] and ((edge[0] == step[0] and edge[1] == step[1]) or (edge[0] == step[1] and edge[1] == step[0])):
-                                self.used_bridges.add((edge[0], edge[1], edge[2]))
-                                break
-                    self.current_position = path[-1][1]
-                    self.update_visualization(current_node=self.current_position)
+                    continue
+                
+                self._path_state = state
+                self.current_position, self.used_bridges = state
+                # В истории - настоящее название моста, а не введенное
+                self.path_history.append((u, v, self.edge_name[bridge_id]))
                     
             except Exception as e:
                 print(f"Ошибка ввода: {e}")
         
-        is_valid, message = self.validate_user_path(path)
+        is_valid, message = self._coverage_result(self._path_state[1])
         print("\nРезультат проверки:")
         print(message)
     
@@ -287,10 +527,8 @@ class KönigsbergBridgesGame:
             path = self.find_eulerian_path()
             if path:
                 print("\nТеоретически возможный маршрут:")
-                for i, (u, v) in enumerate(path, 1):
-                    edge_data = self.graph.get_edge_data(u, v)
-                    first_key = next(iter(edge_data))
-                    print(f"{i}. {edge_data[first_key]['name']}: {u} → {v}")
+                for i, (u, v, bridge) in enumerate(path, 1):
+                    print(f"{i}. {self.edge_name[bridge]}: {u} → {v}")
             else:
                 print("\nНе найдено подходящего пути")
         else:
@@ -314,10 +552,8 @@ class KönigsbergBridgesGame:
                 path = self.find_eulerian_path()
                 if path:
                     print("\nТеоретический маршрут:")
-                    for i, (u, v) in enumerate(path, 1):
-                        edge_data = self.graph.get_edge_data(u, v)
-                        first_key = next(iter(edge_data))
-                        print(f"{i}. {edge_data[first_key]['name']}: {u} → {v}")
+                    for i, (u, v, bridge) in enumerate(path, 1):
+                        print(f"{i}. {self.edge_name[bridge]}: {u} → {v}")
                 else:
                     print("\nПуть невозможен (нечетные степени вершин: A=3, B=3, C=5, D=3)")
             elif choice == '4':